@@ -2,21 +2,22 @@ from __future__ import annotations
 
 import argparse
 import logging
+import os
 import queue
 import signal
 import subprocess
 import threading
+import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Set
 
 import numpy as np
 
 from .audio import AudioConfig, AudioInput
-from .asr import ASRConfig, Transcriber
 from .config import load_triggers_json
 from .matcher import PhraseMatcher
 from .udp_io import UDPConfig, listener_thread, send_udp
-from .utils import normalize_text, setup_logging
+from .utils import normalize_text, parse_cpu_list, setup_logging
 from .vad import SpeechSegmenter, VADConfig
 
 
@@ -37,13 +38,49 @@ def is_listening() -> bool:
     return _LISTENING_EVT.is_set()
 
 
+# What configure_cpu() changed, so trigger commands can be started without it.
+_ORIG_CPUS: Optional[Set[int]] = None
+_SET_ENV: list[str] = []
+
+
+def _unpin_child() -> None:
+    if _ORIG_CPUS:
+        os.sched_setaffinity(0, _ORIG_CPUS)
+
+
 def run_command(cmd: str) -> None:
     try:
-        subprocess.Popen(cmd, shell=True)
+        env = None
+        if _SET_ENV:
+            env = {k: v for k, v in os.environ.items() if k not in _SET_ENV}
+        subprocess.Popen(cmd, shell=True, env=env, preexec_fn=_unpin_child if _ORIG_CPUS else None)
     except Exception as e:
         logging.warning("Command failed: %r", e)
 
 
+def configure_cpu(threads: int, cpus: Optional[Set[int]]) -> int:
+    # Pins the whole process (audio, UDP and ASR threads alike) and bounds OpenMP.
+    # Must run before ctranslate2 is imported: the OpenMP runtime reads its env at load time.
+    global _ORIG_CPUS
+    if not cpus:
+        return threads
+    try:
+        orig = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, cpus)
+    except (AttributeError, OSError) as e:
+        logging.warning("CPU affinity not applied: %r", e)
+        return threads
+
+    _ORIG_CPUS = orig
+    threads = min(threads, len(cpus))
+    for key, val in (("OMP_NUM_THREADS", str(threads)), ("OMP_PROC_BIND", "close"), ("OMP_PLACES", "cores")):
+        if key not in os.environ:
+            os.environ[key] = val
+            _SET_ENV.append(key)
+    logging.info("CPU affinity: %s (ASR threads: %s)", sorted(cpus), threads)
+    return threads
+
+
 def prefetch_model(model_name: str) -> None:
     logging.info("Prefetching model: %s", model_name)
     try:
@@ -61,11 +98,30 @@ def main(argv: Optional[list[str]] = None) -> int:
     ap.add_argument("--device", type=str, default=None, help="sounddevice input device name/index (optional)")
 
     ap.add_argument("--model", type=str, default="tiny.en", help="faster-whisper model name or local path")
-    ap.add_argument("--compute", type=str, default="int8", help="compute type: int8|int8_float16|float16|float32")
+    ap.add_argument(
+        "--compute",
+        type=str,
+        default=None,
+        help="compute type: int8|int8_float16|float16|float32 (default: int8_float16 on cuda/auto, int8 on cpu)",
+    )
     ap.add_argument("--lang", type=str, default="en", help="language hint, or empty for auto")
     ap.add_argument("--asr_device", type=str, default="auto", choices=["auto", "cuda", "cpu"], help="ASR device")
     ap.add_argument("--cpu_threads", type=int, default=4, help="CPU threads for ASR backend")
+    ap.add_argument(
+        "--cpu_affinity",
+        type=parse_cpu_list,
+        default=None,
+        help="pin this process (all threads) to CPUs, e.g. 0-3 or 0,1,2,3; trigger commands run unpinned (optional)",
+    )
     ap.add_argument("--num_workers", type=int, default=1, help="CTranslate2 workers")
+    ap.add_argument("--initial_prompt", type=str, default=None, help="decoder prompt text, e.g. trigger vocabulary")
+    ap.add_argument("--no_speech_threshold", type=float, default=0.6, help="drop segments Whisper rates as no-speech")
+    ap.add_argument(
+        "--max_batch",
+        type=int,
+        default=4,
+        help="max queued segments transcribed in one batch; older segments beyond the newest max_batch are dropped",
+    )
 
     ap.add_argument("--triggers", type=str, default=None, help="path to triggers JSON (optional)")
     ap.add_argument("--threshold", type=int, default=85, help="fuzzy match threshold 0-100")
@@ -76,6 +132,7 @@ def main(argv: Optional[list[str]] = None) -> int:
     ap.add_argument("--max_segment", type=float, default=2.0, help="max speech segment length (sec)")
     ap.add_argument("--min_speech", type=float, default=0.25, help="min speech length (sec) before ASR")
     ap.add_argument("--speech_pad_ms", type=int, default=120, help="padding after speech end (ms)")
+    ap.add_argument("--silence_gate", type=int, default=200, help="skip VAD below this int16 peak level (0 = off)")
 
     ap.add_argument("--udp_in", action="store_true", help="enable UDP listener")
     ap.add_argument("--udp_host", type=str, default="0.0.0.0", help="UDP listen host")
@@ -83,16 +140,31 @@ def main(argv: Optional[list[str]] = None) -> int:
     ap.add_argument("--udp_token", type=str, default=None, help="UDP token (recommended)")
     ap.add_argument("--udp_out_host", type=str, default=None, help="UDP out host (optional)")
     ap.add_argument("--udp_out_port", type=int, default=9999, help="UDP out port (optional)")
+    ap.add_argument(
+        "--udp_reuse_port",
+        action="store_true",
+        help="set SO_REUSEPORT on the listener (other sockets on the port receive a share of messages)",
+    )
     ap.add_argument("--allow_udp_cmd", action="store_true", help="allow UDP CMD:<shell> (DANGEROUS)")
 
     ap.add_argument("--prefetch-model", action="store_true", help="download model weights before start")
-    ap.add_argument("--warmup-sec", type=float, default=0.0, help="warmup decode seconds after model init")
+    ap.add_argument(
+        "--warmup-sec",
+        type=float,
+        default=0.0,
+        help="> 0: run one ASR warmup pass per batch size after model init",
+    )
 
     args = ap.parse_args(argv)
     setup_logging(args.debug)
 
-    triggers_raw = load_triggers_json(args.triggers)
-    triggers = {normalize_text(k): v for k, v in triggers_raw.items()}
+    if args.compute is None:
+        args.compute = "int8" if args.asr_device == "cpu" else "int8_float16"
+
+    args.cpu_threads = configure_cpu(args.cpu_threads, args.cpu_affinity)
+    from .asr import ASRConfig, Transcriber
+
+    triggers = load_triggers_json(args.triggers)
 
     matcher = PhraseMatcher(triggers, threshold=args.threshold, cooldown_sec=args.cooldown)
 
@@ -106,6 +178,10 @@ def main(argv: Optional[list[str]] = None) -> int:
         cpu_threads=args.cpu_threads,
         num_workers=args.num_workers,
         asr_device=args.asr_device,
+        max_segment_sec=args.max_segment,
+        max_batch=args.max_batch,
+        initial_prompt=args.initial_prompt,
+        no_speech_threshold=args.no_speech_threshold,
     )
     transcriber = Transcriber(asr_cfg)
 
@@ -119,6 +195,7 @@ def main(argv: Optional[list[str]] = None) -> int:
         max_segment_sec=args.max_segment,
         min_speech_sec=args.min_speech,
         speech_pad_ms=args.speech_pad_ms,
+        silence_threshold=args.silence_gate,
     )
     segmenter = SpeechSegmenter(vad_cfg)
 
@@ -133,10 +210,11 @@ def main(argv: Optional[list[str]] = None) -> int:
         out_host=args.udp_out_host,
         out_port=args.udp_out_port,
         allow_cmd=args.allow_udp_cmd,
+        reuse_port=args.udp_reuse_port,
     )
 
     stop_evt = threading.Event()
-    segments_q: "queue.Queue[bytes]" = queue.Queue()
+    segments_q: "queue.Queue[np.ndarray]" = queue.Queue(maxsize=2 * max(1, args.max_batch))
 
     def on_pause():
         set_listening(False)
@@ -166,38 +244,62 @@ def main(argv: Optional[list[str]] = None) -> int:
 
     signal.signal(signal.SIGINT, lambda *_: stop_evt.set())
 
+    def handle_text(text: str, dt: float) -> None:
+        if not text:
+            logging.debug("Empty transcription.")
+            return
+
+        logging.info("ASR: %s (%.2fs)", text, dt)
+        result, best_score = matcher.match(text)
+        if result:
+            logging.info("TRIGGER matched: '%s' (score %s) -> run", result.phrase, result.score)
+            run_command(result.command)
+            if udp_cfg.out_host:
+                send_udp(f"TRIGGER:{result.phrase}", udp_cfg.out_host, udp_cfg.out_port, udp_cfg.token)
+        else:
+            logging.debug("No trigger matched (best score: %s)", best_score)
+
     def asr_worker():
         min_frames = segmenter.min_frames_before_transcribe()
-        frame_bytes = segmenter.frame_bytes
+        frame_len = segmenter.frame_len
         while not stop_evt.is_set():
             try:
                 seg = segments_q.get(timeout=0.2)
             except queue.Empty:
                 continue
 
+            # Under load (e.g. thermal throttling) only the newest speech is worth transcribing:
+            # keep the newest max_batch segments (one generate() call) and drop the rest.
+            if segments_q.qsize() > args.max_batch - 1:
+                dropped = 0
+                while segments_q.qsize() > args.max_batch - 1:
+                    try:
+                        seg = segments_q.get_nowait()
+                        dropped += 1
+                    except queue.Empty:
+                        break
+                logging.debug("ASR behind; dropped %s stale segment(s)", dropped)
+
+            batch = [seg]
+            while len(batch) < args.max_batch:
+                try:
+                    batch.append(segments_q.get_nowait())
+                except queue.Empty:
+                    break
+
             if not is_listening():
                 continue
 
-            total_frames = len(seg) // frame_bytes
-            if total_frames < min_frames:
-                logging.debug("Segment too short, skipping (%s frames)", total_frames)
-                continue
+            audio_batch = []
+            for seg in batch:
+                total_frames = seg.size // frame_len
+                if total_frames < min_frames:
+                    logging.debug("Segment too short, skipping (%s frames)", total_frames)
+                    continue
+                audio_batch.append(seg)
 
-            pcm16 = np.frombuffer(seg, dtype=np.int16)
-            text, dt = transcriber.transcribe_pcm16(pcm16)
-            if not text:
-                logging.debug("Empty transcription.")
-                continue
-
-            logging.info("ASR: %s (%.2fs)", text, dt)
-            result, best_score = matcher.match(text)
-            if result:
-                logging.info("TRIGGER matched: '%s' (score %s) -> run", result.phrase, result.score)
-                run_command(result.command)
-                if udp_cfg.out_host:
-                    send_udp(f"TRIGGER:{result.phrase}", udp_cfg.out_host, udp_cfg.out_port, udp_cfg.token)
-            else:
-                logging.debug("No trigger matched (best score: %s)", best_score)
+            for text, dt in transcriber.transcribe_batch(audio_batch):
+                handle_text(text, dt)
 
     threading.Thread(target=asr_worker, daemon=True).start()
 
@@ -205,8 +307,9 @@ def main(argv: Optional[list[str]] = None) -> int:
     with audio.stream():
         while not stop_evt.is_set():
             try:
-                frame = audio.q.get(timeout=0.2)
-            except queue.Empty:
+                frame = audio.q.popleft()
+            except IndexError:
+                time.sleep(0.005)
                 continue
 
             if not is_listening():
@@ -214,7 +317,14 @@ def main(argv: Optional[list[str]] = None) -> int:
 
             seg, _in_speech = segmenter.process_one_frame(frame)
             if seg is not None:
-                segments_q.put(seg)
+                try:
+                    segments_q.put_nowait(seg)
+                except queue.Full:
+                    try:
+                        segments_q.get_nowait()
+                    except queue.Empty:
+                        pass
+                    segments_q.put_nowait(seg)
 
     logging.info("Bye.")
     return 0
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import ctypes
 import logging
 import time
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 
+import ctranslate2
 import numpy as np
 from faster_whisper import WhisperModel
+from faster_whisper.tokenizer import Tokenizer
+
+
+MAX_DECODE_TOKENS = 448
 
 
 @dataclass(frozen=True)
@@ -17,16 +23,93 @@ class ASRConfig:
     cpu_threads: int = 4
     num_workers: int = 1
     asr_device: str = "auto"  # auto|cuda|cpu
+    max_segment_sec: float = 2.0
+    max_batch: int = 4
+    initial_prompt: Optional[str] = None
+    no_speech_threshold: float = 0.6
+    log_prob_threshold: float = -1.0
+    compression_ratio_threshold: float = 2.4
+
+
+def pinned_empty(shape: Tuple[int, ...], dtype=np.float32) -> Optional[np.ndarray]:
+    # Page-locked host array via cudaHostAlloc; H2D copies from it skip the driver's
+    # pageable staging copy. Returns None when the CUDA runtime isn't available.
+    # The allocation is never freed: callers keep it for the life of the process.
+    for name in ("libcudart.so", "libcudart.so.12", "libcudart.so.11.0"):
+        try:
+            cudart = ctypes.CDLL(name)
+            break
+        except OSError:
+            continue
+    else:
+        return None
+
+    nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    ptr = ctypes.c_void_p()
+    # cudaHostAllocPortable: pinned for every context, incl. the one CTranslate2 creates.
+    if cudart.cudaHostAlloc(ctypes.byref(ptr), ctypes.c_size_t(nbytes), 1) != 0 or not ptr.value:
+        return None
+    raw = (ctypes.c_byte * nbytes).from_address(ptr.value)
+    return np.frombuffer(raw, dtype=dtype).reshape(shape)
 
 
-def pcm16_to_float32(pcm16: np.ndarray) -> np.ndarray:
-    return (pcm16.astype(np.float32) / 32768.0).clip(-1.0, 1.0)
+def pcm16_to_float32(pcm16: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    # int16 / 32768 already lies in [-1, 1), so a single fused multiply is enough (no clip).
+    if out is None:
+        out = np.empty(pcm16.size, dtype=np.float32)
+    np.multiply(pcm16, np.float32(1.0 / 32768.0), out=out, dtype=np.float32, casting="unsafe")
+    return out
 
 
 class Transcriber:
     def __init__(self, cfg: ASRConfig):
         self.cfg = cfg
         self.model = self._init_model()
+        # Matches SpeechSegmenter's sample cap, so live segments always fit. The encoder shape
+        # is fixed by _features() padding the mel to nb_max_frames; this only bounds the buffer.
+        self._fixed_len = int(16000 * cfg.max_segment_sec)
+        self._audio_buf = np.zeros(self._fixed_len, dtype=np.float32)
+        self._tokenizer, self._prompt = self._init_prompt()
+        self._feat_shape = self._features(self._audio_buf).shape
+        self._feat_buf = self._init_feat_buf()
+
+    def _init_feat_buf(self) -> np.ndarray:
+        shape = (max(1, self.cfg.max_batch),) + tuple(self._feat_shape)
+        if self.model.model.device == "cuda":
+            buf = pinned_empty(shape)
+            if buf is not None:
+                logging.debug("ASR features: pinned host buffer %s", shape)
+                return buf
+            logging.debug("ASR features: pinned alloc unavailable, using pageable memory")
+        return np.empty(shape, dtype=np.float32)
+
+    def _init_prompt(self) -> Tuple[Optional[Tokenizer], Optional[List[int]]]:
+        # The low-level generate() path needs one fixed prompt; multilingual models without a
+        # language hint must detect the language per segment, so they keep the full pipeline.
+        multilingual = self.model.model.is_multilingual
+        if multilingual and not self.cfg.lang:
+            return None, None
+        tokenizer = Tokenizer(
+            self.model.hf_tokenizer,
+            multilingual,
+            task="transcribe",
+            language=self.cfg.lang or "en",
+        )
+        prompt: List[int] = []
+        if self.cfg.initial_prompt:
+            prev = tokenizer.encode(" " + self.cfg.initial_prompt.strip())
+            prompt = [tokenizer.sot_prev] + prev[-(MAX_DECODE_TOKENS // 2 - 1):]
+        # <|notimestamps|> drops the timestamp-token branch from every decoder step.
+        return tokenizer, prompt + list(tokenizer.sot_sequence) + [tokenizer.no_timestamps]
+
+    def _compute_for(self, device: str) -> str:
+        # On CUDA, plain int8 keeps activations in fp32; int8_float16 routes the GEMMs
+        # through CTranslate2's INT8 Tensor Core kernels with fp16 activations.
+        if device == "cuda" and self.cfg.compute == "int8":
+            return "int8_float16"
+        if device == "cpu" and self.cfg.compute == "int8_float16":
+            return "int8"
+        return self.cfg.compute
 
     def _init_model(self) -> WhisperModel:
         if self.cfg.asr_device not in ("auto", "cuda", "cpu"):
@@ -34,11 +117,12 @@ class Transcriber:
 
         if self.cfg.asr_device in ("auto", "cuda"):
             try:
-                logging.info("ASR backend: CUDA (attempt)")
+                compute = self._compute_for("cuda")
+                logging.info("ASR backend: CUDA (attempt, compute=%s)", compute)
                 return WhisperModel(
                     self.cfg.model,
                     device="cuda",
-                    compute_type=self.cfg.compute,
+                    compute_type=compute,
                     cpu_threads=self.cfg.cpu_threads,
                     num_workers=self.cfg.num_workers,
                 )
@@ -47,11 +131,12 @@ class Transcriber:
                     raise
                 logging.warning("CUDA init failed; falling back to CPU: %r", e)
 
-        logging.info("ASR backend: CPU")
+        compute = self._compute_for("cpu")
+        logging.info("ASR backend: CPU (compute=%s)", compute)
         return WhisperModel(
             self.cfg.model,
             device="cpu",
-            compute_type=self.cfg.compute,
+            compute_type=compute,
             cpu_threads=self.cfg.cpu_threads,
             num_workers=self.cfg.num_workers,
         )
@@ -59,23 +144,50 @@ class Transcriber:
     def warmup(self, seconds: float = 1.0) -> None:
         if seconds <= 0:
             return
-        logging.info("ASR warmup: %.2fs", seconds)
-        n = int(16000 * seconds)
-        audio = np.zeros(n, dtype=np.float32)
+        # Inputs are always padded to _fixed_len, so repeating a pass adds nothing and
+        # `seconds` only switches warmup on. The worker issues batches of
+        # 1..max_batch, and each size is run once so the first live batch of that size
+        # doesn't pay the encoder's first-use allocations (decoder length still varies).
+        sizes = range(1, max(1, self.cfg.max_batch) + 1) if self._tokenizer is not None else range(1, 2)
+        logging.info("ASR warmup: batch sizes %d..%d", sizes[0], sizes[-1])
+        audio = np.zeros(self._fixed_len, dtype=np.float32)
         try:
-            self.model.transcribe(
-                audio,
-                language=self.cfg.lang,
-                vad_filter=False,
-                beam_size=1,
-                best_of=1,
-                condition_on_previous_text=False,
-            )
+            self.transcribe(audio)
+            for b in sizes[1:]:
+                self._generate([audio] * b)
         except Exception as e:
             logging.debug("Warmup failed (non-fatal): %r", e)
 
+    def _fill_fixed(self, audio: np.ndarray) -> np.ndarray:
+        n = min(audio.size, self._fixed_len)
+        if n < audio.size:
+            logging.debug("Segment truncated to %.2fs", self.cfg.max_segment_sec)
+        if audio.dtype == np.int16:
+            pcm16_to_float32(audio[:n], self._audio_buf[:n])
+        else:
+            self._audio_buf[:n] = audio[:n]
+        self._audio_buf[n:] = 0.0
+        return self._audio_buf
+
     def transcribe_pcm16(self, pcm16: np.ndarray) -> Tuple[str, float]:
-        audio = pcm16_to_float32(pcm16)
+        return self.transcribe(pcm16)
+
+    def transcribe(self, audio: np.ndarray) -> Tuple[str, float]:
+        # Accepts float32 samples in [-1, 1) (the live pipeline) or raw PCM16.
+        if self._tokenizer is None:
+            return self._transcribe_full(audio)
+        return self._generate([audio])[0]
+
+    def transcribe_batch(self, batch: Sequence[np.ndarray]) -> List[Tuple[str, float]]:
+        if not batch:
+            return []
+        if self._tokenizer is None:
+            return [self._transcribe_full(audio) for audio in batch]
+        return self._generate(batch)
+
+    def _transcribe_full(self, audio: np.ndarray) -> Tuple[str, float]:
+        # faster-whisper's high-level pipeline (per-segment language detection).
+        audio = self._fill_fixed(audio)
         t0 = time.time()
         segments, _ = self.model.transcribe(
             audio,
@@ -85,7 +197,62 @@ class Transcriber:
             best_of=1,
             condition_on_previous_text=False,
             word_timestamps=False,
+            without_timestamps=True,
+            suppress_blank=True,
+            initial_prompt=self.cfg.initial_prompt,
+            no_speech_threshold=self.cfg.no_speech_threshold,
+            log_prob_threshold=self.cfg.log_prob_threshold,
+            compression_ratio_threshold=self.cfg.compression_ratio_threshold,
         )
         dt = time.time() - t0
         text = "".join(seg.text for seg in segments).strip()
         return text, dt
+
+    def _features(self, audio: np.ndarray) -> np.ndarray:
+        feats = self.model.feature_extractor(audio)
+        n_frames = self.model.feature_extractor.nb_max_frames
+        if feats.shape[-1] >= n_frames:
+            return feats[:, :n_frames]
+        return np.pad(feats, ((0, 0), (0, n_frames - feats.shape[-1])))
+
+    def _generate(self, batch: Sequence[np.ndarray]) -> List[Tuple[str, float]]:
+        # Straight to ctranslate2.models.Whisper.generate() with the cached prompt: skips
+        # faster-whisper's segment/seek loop, which dominates latency on short clips.
+        t0 = time.time()
+        n = len(batch)
+        if n <= self._feat_buf.shape[0]:
+            feats = self._feat_buf[:n]
+        else:
+            feats = np.empty((n,) + tuple(self._feat_shape), dtype=np.float32)
+        for i, audio in enumerate(batch):
+            feats[i] = self._features(self._fill_fixed(audio))
+        results = self.model.model.generate(
+            ctranslate2.StorageView.from_array(feats),
+            [self._prompt] * len(batch),
+            beam_size=1,
+            max_length=MAX_DECODE_TOKENS,
+            suppress_blank=True,
+            return_scores=True,
+            return_no_speech_prob=True,
+        )
+        dt = time.time() - t0
+
+        eot = self._tokenizer.eot
+        out: List[Tuple[str, float]] = []
+        for res in results:
+            tokens = [t for t in res.sequences_ids[0] if t < eot]
+            text = self._tokenizer.decode(tokens).strip()
+            if self._no_speech(len(res.sequences_ids[0]), res.scores[0], res.no_speech_prob):
+                text = ""
+            out.append((text, dt))
+        return out
+
+    def _no_speech(self, n_tokens: int, score: float, no_speech_prob: float) -> bool:
+        # faster-whisper's no-speech rule (VAD false positives the encoder flags as silence).
+        # Its log-prob / compression-ratio checks only trigger temperature fallback, which
+        # this greedy path doesn't do, so they are not applied here.
+        avg_logprob = score * n_tokens / (n_tokens + 1)
+        if no_speech_prob > self.cfg.no_speech_threshold and avg_logprob < self.cfg.log_prob_threshold:
+            logging.debug("ASR: no speech (p=%.2f, avg_logprob=%.2f)", no_speech_prob, avg_logprob)
+            return True
+        return False
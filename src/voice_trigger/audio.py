@@ -1,7 +1,7 @@
 from __future__ import annotations
 
+import collections
 import logging
-import queue
 from dataclasses import dataclass
 from typing import Optional
 
@@ -22,13 +22,15 @@ class AudioInput:
         self.cfg = cfg
         self.frame_samples = frame_samples
         self.device = device
-        self.q: "queue.Queue[bytes]" = queue.Queue()
+        # deque.append/popleft are atomic in CPython: no lock/condvar on the audio callback thread.
+        # Bounded so a stalled consumer drops the oldest frames instead of growing without limit.
+        self.q: "collections.deque[np.ndarray]" = collections.deque(maxlen=512)
 
     def _cb(self, indata, frames, time_info, status) -> None:
         if status:
             logging.debug("Audio status: %s", status)
-        pcm16 = (indata[:, 0] * 32768.0).astype(np.int16).tobytes()
-        self.q.put(pcm16)
+        # Frames stay float32 end-to-end; only the VAD needs PCM16.
+        self.q.append(indata[:, 0].copy())
 
     def stream(self) -> sd.InputStream:
         return sd.InputStream(
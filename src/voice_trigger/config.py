@@ -1,9 +1,15 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Dict, Optional
 
+try:
+    import orjson as _json  # type: ignore
+except ImportError:  # optional; stdlib json is fine for a small triggers file
+    import json as _json  # type: ignore
+
+from .utils import normalize_text
+
 
 DEFAULT_TRIGGERS: Dict[str, str] = {
     "open browser": "xdg-open https://www.wikipedia.org",
@@ -13,15 +19,16 @@ DEFAULT_TRIGGERS: Dict[str, str] = {
 
 
 def load_triggers_json(path: Optional[str]) -> Dict[str, str]:
+    # Keys come back normalized (see normalize_text) so callers can look phrases up directly.
     if not path:
-        return dict(DEFAULT_TRIGGERS)
+        return {normalize_text(k): v for k, v in DEFAULT_TRIGGERS.items()}
     p = Path(path)
-    data = json.loads(p.read_text(encoding="utf-8"))
+    data = _json.loads(p.read_bytes())
     if not isinstance(data, dict):
         raise ValueError("Triggers JSON must be an object: {\"phrase\": \"command\", ...}")
     out: Dict[str, str] = {}
     for k, v in data.items():
         if not isinstance(k, str) or not isinstance(v, str):
             raise ValueError("Triggers JSON must map string -> string")
-        out[k] = v
+        out[normalize_text(k)] = v
     return out
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-import time
+import re
 from dataclasses import dataclass
+from time import monotonic_ns
 from typing import Dict, Optional, Tuple
 
 from rapidfuzz import fuzz, process
@@ -37,38 +38,59 @@ class PhraseMatcher:
             self.triggers[p] = cmd
             self.tokens[p] = set(p.split())
 
-        self._cooldowns: Dict[str, float] = {}
+        self._phrases = list(self.triggers.keys())
+        self._phrase_tokens = [self.tokens[p] for p in self._phrases]
+        # One alternation scanned in a single pass; longest first so "turn off screen" wins
+        # over a shorter phrase starting at the same position. Whitespace-bounded like the tokens.
+        by_len = sorted((p for p in self._phrases if p), key=len, reverse=True)
+        self._exact_re: Optional[re.Pattern[str]] = (
+            re.compile(r"(?<!\S)(" + "|".join(map(re.escape, by_len)) + r")(?!\S)") if by_len else None
+        )
+        self._cooldown_ns = int(cooldown_sec * 1_000_000_000)
+        self._cooldowns: Dict[str, int] = {}
 
     def match(self, text: str) -> Tuple[Optional[MatchResult], int]:
         txt = normalize_text(text)
         if not txt or len(txt) < self.min_chars:
             return None, 0
 
+        # Clean transcriptions hit a phrase verbatim; skip fuzzy scoring for those.
+        if txt in self.triggers:
+            return self._fire(txt, 100)
+        if self._exact_re is not None:
+            m = self._exact_re.search(txt)
+            if m:
+                return self._fire(m.group(1), 100)
+
         txt_tokens = set(txt.split())
 
-        candidates = []
-        for phrase in self.triggers.keys():
-            phrase_tokens = self.tokens[phrase]
-            if self.require_all_tokens and len(phrase_tokens) > 1:
-                if not phrase_tokens.issubset(txt_tokens):
-                    continue
-            candidates.append(phrase)
+        if self.require_all_tokens:
+            candidates = [
+                p
+                for p, toks in zip(self._phrases, self._phrase_tokens)
+                if len(toks) <= 1 or toks.issubset(txt_tokens)
+            ]
+        else:
+            candidates = self._phrases
 
         if not candidates:
             return None, 0
 
-        best = process.extractOne(txt, candidates, scorer=fuzz.ratio)
-        if not best:
-            return None, 0
-
-        match_phrase, score, _ = best
-        score_i = int(score)
+        # One vectorized call scores every candidate (SIMD in rapidfuzz's C++ core).
+        scores = process.cdist([txt], candidates, scorer=fuzz.ratio, workers=1)[0]
+        best_i = int(scores.argmax())
+        match_phrase = candidates[best_i]
+        score_i = int(scores[best_i])
 
         if score_i >= self.threshold:
-            now = time.time()
-            last = self._cooldowns.get(match_phrase, 0.0)
-            if (now - last) >= self.cooldown_sec:
-                self._cooldowns[match_phrase] = now
-                return MatchResult(match_phrase, self.triggers[match_phrase], score_i), score_i
+            return self._fire(match_phrase, score_i)
 
         return None, score_i
+
+    def _fire(self, phrase: str, score: int) -> Tuple[Optional[MatchResult], int]:
+        now = monotonic_ns()
+        last = self._cooldowns.get(phrase)
+        if last is None or (now - last) >= self._cooldown_ns:
+            self._cooldowns[phrase] = now
+            return MatchResult(phrase, self.triggers[phrase], score), score
+        return None, score
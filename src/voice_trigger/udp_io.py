@@ -16,14 +16,27 @@ class UDPConfig:
     out_host: Optional[str] = None
     out_port: int = 9999
     allow_cmd: bool = False  # security: off by default
+    rcvbuf: int = 2_000_000  # capped by net.core.rmem_max
+    reuse_port: bool = False  # SO_REUSEPORT splits datagrams across sockets; opt-in only
+
+
+_TX_SOCK: Optional[socket.socket] = None
+_TX_LOCK = threading.Lock()
+
+
+def _tx_sock() -> socket.socket:
+    global _TX_SOCK
+    if _TX_SOCK is None:
+        _TX_SOCK = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    return _TX_SOCK
 
 
 def send_udp(msg: str, host: str, port: int, token: Optional[str] = None) -> None:
     try:
         if token:
             msg = f"{token}:{msg}"
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-            sock.sendto(msg.encode("utf-8", errors="ignore"), (host, port))
+        with _TX_LOCK:
+            _tx_sock().sendto(msg.encode("utf-8", errors="ignore"), (host, port))
         logging.debug("[UDP OUT] %s:%s <- %s", host, port, msg)
     except Exception as e:
         logging.warning("UDP send failed: %r", e)
@@ -41,10 +54,28 @@ def listener_thread(
         return
 
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        # A larger buffer absorbs trigger bursts; the kernel silently caps it at rmem_max.
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, cfg.rcvbuf)
+        # Linux reports the doubled (bookkeeping-inclusive) size, hence the // 2.
+        actual = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) // 2
+        if actual < cfg.rcvbuf:
+            logging.debug("UDP SO_RCVBUF capped at %s bytes (requested %s; see net.core.rmem_max)", actual, cfg.rcvbuf)
+    except OSError as e:
+        logging.debug("UDP SO_RCVBUF failed (non-fatal): %r", e)
+
+    if cfg.reuse_port:
+        # Must precede bind(). Note that peers bound to the same port share (not copy) datagrams.
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        except (AttributeError, OSError) as e:
+            logging.warning("UDP SO_REUSEPORT not applied: %r", e)
+
     try:
         sock.bind((cfg.host, cfg.port))
     except Exception as e:
         logging.error("UDP bind failed on %s:%s -> %r", cfg.host, cfg.port, e)
+        sock.close()
         return
 
     sock.settimeout(0.5)
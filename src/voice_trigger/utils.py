@@ -2,6 +2,10 @@ from __future__ import annotations
 
 import logging
 import unicodedata
+from typing import Set
+
+
+_PUNCT_TABLE = str.maketrans({c: " " for c in ",.;:!?\"'()[]{}"})
 
 
 def setup_logging(debug: bool) -> None:
@@ -13,8 +17,30 @@ def setup_logging(debug: bool) -> None:
 
 
 def normalize_text(s: str) -> str:
-    s = s.lower().strip()
-    s = "".join(c for c in unicodedata.normalize("NFKD", s) if not unicodedata.combining(c))
-    for ch in ",.;:!?\"'()[]{}":
-        s = s.replace(ch, " ")
-    return " ".join(s.split())
+    s = s.lower()
+    # ASCII text (the common tiny.en case) has nothing to decompose; skip the NFKD pass.
+    if not s.isascii():
+        s = "".join(c for c in unicodedata.normalize("NFKD", s) if not unicodedata.combining(c))
+    return " ".join(s.translate(_PUNCT_TABLE).split())
+
+
+def parse_cpu_list(spec: str) -> Set[int]:
+    # "0-3" or "0,1,2,3" or "0-1,4"
+    cpus: Set[int] = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = (int(x) for x in part.split("-", 1))
+            if lo < 0 or hi < lo:
+                raise ValueError(f"Bad CPU range: {part!r}")
+            cpus.update(range(lo, hi + 1))
+        else:
+            cpu = int(part)
+            if cpu < 0:
+                raise ValueError(f"Bad CPU index: {part!r}")
+            cpus.add(cpu)
+    if not cpus:
+        raise ValueError(f"Empty CPU list: {spec!r}")
+    return cpus
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-import time
 from dataclasses import dataclass
+from time import monotonic_ns
 from typing import Optional, Tuple
 
+import numpy as np
 import webrtcvad
 
 
@@ -15,6 +16,7 @@ class VADConfig:
     max_segment_sec: float = 2.0
     min_speech_sec: float = 0.25
     speech_pad_ms: int = 120
+    silence_threshold: int = 200  # peak level (int16 units) below which the VAD is skipped; 0 disables
 
 
 class SpeechSegmenter:
@@ -25,43 +27,77 @@ class SpeechSegmenter:
         self.frame_len = int(cfg.sample_rate * (cfg.frame_ms / 1000.0))
         self.frame_bytes = self.frame_len * 2
         self.pad_frames = int(cfg.speech_pad_ms / cfg.frame_ms)
+        self._max_segment_ns = int(cfg.max_segment_sec * 1_000_000_000)
+        self._silence_peak = cfg.silence_threshold / 32768.0
+        self._f_tmp = np.empty(self.frame_len, dtype=np.float32)
+        self._i16_buf = np.empty(self.frame_len, dtype=np.int16)
+
+        # Hard cap in samples (matches the Transcriber's input length): the wall-clock check
+        # below lags when frames are drained from a backlog faster than real time.
+        self.max_segment_samples = max(int(cfg.sample_rate * cfg.max_segment_sec), self.frame_len)
+        self._buf = np.empty(self.max_segment_samples, dtype=np.float32)
+        self._wpos = 0
 
         self.reset()
 
     def reset(self) -> None:
-        self.speech_frames: list[bytes] = []
+        self._wpos = 0
         self.trailing_non_speech = 0
         self.in_speech = False
-        self.start_time: Optional[float] = None
+        self.start_time_ns: Optional[int] = None
+
+    def process_one_frame(self, frame: np.ndarray) -> Tuple[Optional[np.ndarray], bool]:
+        if frame.size != self.frame_len:
+            raise ValueError(f"Expected {self.frame_len} samples, got {frame.size}")
 
-    def process_one_frame(self, frame_bytes: bytes) -> Tuple[Optional[bytes], bool]:
-        if len(frame_bytes) != self.frame_bytes:
-            raise ValueError(f"Expected {self.frame_bytes} bytes, got {len(frame_bytes)}")
+        # Cheap peak gate: most idle frames are near-silent and can't start a segment,
+        # so don't pay for the webrtcvad call on them.
+        if not self.in_speech and np.abs(frame).max() < self._silence_peak:
+            return None, False
 
-        is_speech = self.vad.is_speech(frame_bytes, self.cfg.sample_rate)
+        is_speech = self.vad.is_speech(self._to_pcm16(frame), self.cfg.sample_rate)
 
         if is_speech:
             if not self.in_speech:
                 self.in_speech = True
-                self.start_time = time.time()
-            self.speech_frames.append(frame_bytes)
+                self.start_time_ns = monotonic_ns()
+            self._append(frame)
             self.trailing_non_speech = 0
         else:
             if self.in_speech:
                 self.trailing_non_speech += 1
                 if self.trailing_non_speech <= self.pad_frames:
-                    self.speech_frames.append(frame_bytes)
+                    self._append(frame)
                 if self.trailing_non_speech >= self.pad_frames:
-                    seg = b"".join(self.speech_frames)
-                    self.reset()
-                    return seg, False
+                    return self._take(), False
 
-        if self.in_speech and self.start_time and (time.time() - self.start_time) > self.cfg.max_segment_sec:
-            seg = b"".join(self.speech_frames)
-            self.reset()
-            return seg, False
+        if self.in_speech and self.start_time_ns is not None:
+            if (monotonic_ns() - self.start_time_ns) > self._max_segment_ns:
+                return self._take(), False
+
+        if self.in_speech and self._wpos + self.frame_len > self.max_segment_samples:
+            return self._take(), False
 
         return None, self.in_speech
 
+    def _to_pcm16(self, frame: np.ndarray) -> bytes:
+        # Scale/round/saturate in preallocated buffers; no per-frame temporaries.
+        np.multiply(frame, 32767.0, out=self._f_tmp)
+        np.rint(self._f_tmp, out=self._f_tmp)
+        np.clip(self._f_tmp, -32768.0, 32767.0, out=self._f_tmp)
+        np.copyto(self._i16_buf, self._f_tmp, casting="unsafe")
+        return self._i16_buf.tobytes()
+
+    def _append(self, frame: np.ndarray) -> None:
+        self._buf[self._wpos:self._wpos + self.frame_len] = frame
+        self._wpos += self.frame_len
+
+    def _take(self) -> np.ndarray:
+        # One copy out of the reusable buffer: the segment is handed to the ASR thread
+        # while this buffer is already being refilled.
+        seg = self._buf[:self._wpos].copy()
+        self.reset()
+        return seg
+
     def min_frames_before_transcribe(self) -> int:
         return int((self.cfg.min_speech_sec * 1000) / self.cfg.frame_ms)